@@ -1,15 +1,26 @@
 import sys
 import os
+import json
 import logging
-import hashlib
 import asyncio
+import contextlib
+import sqlite3
+import subprocess
+import tempfile
+import threading
+from bisect import bisect_right
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+import httpx
 import openai
-import whisper
+import tiktoken
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+from faster_whisper.vad import VadOptions, get_speech_timestamps, merge_segments
 import yt_dlp
 import numpy as np
+import xxhash
 import noisereduce as nr
-import soundfile as sf
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters
 
@@ -19,12 +30,52 @@ openai.api_key = os.getenv("OPENAI_API_KEY")
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 
 # Конфигурация
-WHISPER_MODEL = "base"
+# Имя модели или путь к весам, сконвертированным ct2-transformers-converter
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cuda")
+# int8-веса: на GPU с float16-активациями, на CPU чистый int8;
+# WHISPER_COMPUTE_TYPE=float16 закрепляет чистый FP16 на GPU
+WHISPER_COMPUTE_TYPE = os.getenv(
+    "WHISPER_COMPUTE_TYPE",
+    "int8_float16" if WHISPER_DEVICE == "cuda" else "int8"
+)
+# Fused flash-attention в CTranslate2 (нужна GPU Ampere и новее)
+WHISPER_FLASH_ATTENTION = (
+    WHISPER_DEVICE == "cuda" and os.getenv("WHISPER_FLASH_ATTENTION") == "1"
+)
+WHISPER_BATCH_SIZE = 16  # подбирается под объём памяти GPU
+WHISPER_SAMPLE_RATE = 16000
+# Язык записей (например, "ru"); если не задан, определяется по каждой записи
+WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE") or None
+WHISPER_VAD_OPTIONS = VadOptions(max_speech_duration_s=30, min_silence_duration_ms=160)
+BATCH_WINDOW = 0.2  # сколько ждать другие записи перед запуском общего батча, с
+BATCH_MAX_FILES = 8
+# Сколько обновлений Telegram обрабатывается одновременно: по умолчанию PTB
+# ждёт окончания обработчика, прежде чем взять следующее обновление
+CONCURRENT_UPDATES = 16
 GPT_MODEL = "gpt-4-turbo"
+CHUNK_TOKENS = 8000  # длинные расшифровки анализируются по частям параллельно
+CHUNK_OVERLAP = 500
+CHUNK_SNAP_CHARS = 50  # насколько далеко искать пробел для границы фрагмента
+TOKENIZER_ENCODING = "cl100k_base"
 MAX_DURATION = 2 * 60 * 60  # 2 часа
+# Шумоподавление только для записей с заметным фоном: уровень шума оцениваем
+# по 10-му перцентилю RMS 30-мс фреймов первых 5 секунд (паузы между словами)
+NOISE_FLOOR_THRESHOLD = 0.005  # около -46 dBFS
+NOISE_FLOOR_PERCENTILE = 10
+NOISE_FRAME_MS = 30
+NOISE_ESTIMATE_SECONDS = 5
+NOISE_BLOCK_SECONDS = 10  # шумоподавление блоками ограничивает пиковую память
+NOISE_BLOCK_OVERLAP_SECONDS = 0.5  # перекрытие блоков для плавной склейки
 AUDIO_CACHE = "audio_cache"
+CACHE_DB = "cache.db"
+HASH_BLOCK_SIZE = 1024 * 1024
 os.makedirs(AUDIO_CACHE, exist_ok=True)
 
+# На уровне модуля только конфигурация: клиенты, кэш и модели
+# создаются в main()/post_init
+CACHE: sqlite3.Connection | None = None
+
 # Настройка логгера
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -32,6 +83,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def open_cache() -> None:
+    # Кэш расшифровок и протоколов в одной SQLite-базе вместо файла на каждый ключ
+    global CACHE
+    CACHE = sqlite3.connect(CACHE_DB, isolation_level=None, check_same_thread=False)
+    CACHE.execute("PRAGMA journal_mode=WAL")
+    CACHE.execute("PRAGMA synchronous=NORMAL")
+    CACHE.execute("CREATE TABLE IF NOT EXISTS kv(k TEXT PRIMARY KEY, v TEXT) WITHOUT ROWID")
+
+def read_cache(key: str) -> str | None:
+    row = CACHE.execute("SELECT v FROM kv WHERE k = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+def write_cache(key: str, text: str) -> None:
+    CACHE.execute("INSERT OR REPLACE INTO kv(k, v) VALUES (?, ?)", (key, text))
+
+class NoSpeechError(ValueError):
+    pass
+
 class AudioProcessor:
     @staticmethod
     def download_youtube_audio(url: str) -> str:
@@ -50,40 +119,248 @@ class AudioProcessor:
             return ydl.prepare_filename(info).replace(".webm", ".wav")
 
     @staticmethod
-    def clean_audio(input_path: str) -> str:
+    def hash_audio(source: str | BytesIO) -> str:
+        # Хэш содержимого файла, читаемого блоками по 1 МБ
+        digest = xxhash.xxh3_128()
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                while block := f.read(HASH_BLOCK_SIZE):
+                    digest.update(block)
+        else:
+            while block := source.read(HASH_BLOCK_SIZE):
+                digest.update(block)
+            source.seek(0)
+        return digest.hexdigest()
+
+    @staticmethod
+    def load_audio(source: str | BytesIO) -> tuple[np.ndarray, int]:
+        # ffmpeg сразу приводит запись к 16 кГц mono, как нужно Whisper:
+        # шумоподавлению и распознаванию достаётся в разы меньше отсчётов
+        if not isinstance(source, str) and bytes(source.getbuffer()[4:8]) == b"ftyp":
+            # В MP4/M4A индекс (moov) обычно в конце файла, и из pipe ffmpeg
+            # его не находит: такие записи декодируем из временного файла
+            with tempfile.NamedTemporaryFile(dir=AUDIO_CACHE, suffix=".m4a", delete=False) as f:
+                f.write(source.getbuffer())
+            try:
+                return AudioProcessor.load_audio(f.name)
+            finally:
+                os.remove(f.name)
+
+        if isinstance(source, str):
+            input_arg, stdin_kwargs = source, {"stdin": subprocess.DEVNULL}
+        else:
+            input_arg, stdin_kwargs = "pipe:0", {"input": source.getvalue()}
+        command = [
+            "ffmpeg", "-loglevel", "error", "-i", input_arg,
+            "-ac", "1", "-ar", str(WHISPER_SAMPLE_RATE), "-f", "s16le", "pipe:1"
+        ]
+        try:
+            result = subprocess.run(command, capture_output=True, check=True, **stdin_kwargs)
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr.decode(errors="replace").strip()
+            logger.error(f"Audio decoding failed: {stderr}")
+            raise RuntimeError(f"ffmpeg failed: {stderr}") from e
+        data = np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+        if len(data) == 0:
+            stderr = result.stderr.decode(errors="replace").strip()
+            raise ValueError(f"Empty audio file: {stderr}" if stderr else "Empty audio file")
+        return data, WHISPER_SAMPLE_RATE
+
+    @staticmethod
+    def estimate_noise_floor(data: np.ndarray, rate: int) -> float:
+        frame = rate * NOISE_FRAME_MS // 1000
+        head = data[:rate * NOISE_ESTIMATE_SECONDS]
+        frames = head[:len(head) // frame * frame].reshape(-1, frame)
+        if len(frames) == 0:
+            return float(np.sqrt(np.mean(head ** 2)))
+        rms = np.sqrt(np.mean(frames ** 2, axis=1))
+        return float(np.percentile(rms, NOISE_FLOOR_PERCENTILE))
+
+    @staticmethod
+    def clean_audio(data: np.ndarray, rate: int) -> np.ndarray:
         try:
-            data, rate = sf.read(input_path)
-            if len(data) == 0:
-                raise ValueError("Empty audio file")
-            
-            reduced_noise = nr.reduce_noise(y=data, sr=rate)
-            output_path = input_path.replace(".wav", "_cleaned.wav")
-            sf.write(output_path, reduced_noise, rate)
-            return output_path
+            # Whisper устойчив к фоновому шуму, поэтому записи с низким
+            # уровнем шума отдаём ему без обработки
+            if AudioProcessor.estimate_noise_floor(data, rate) < NOISE_FLOOR_THRESHOLD:
+                return data
+
+            # Блоки по 10 секунд обрабатываются по очереди и пишутся на место исходных;
+            # короткий хвост присоединяется к предыдущему блоку. Каждый блок захватывает
+            # исходные отсчёты перед собой, и стык сводится линейным кроссфейдом,
+            # чтобы смена оценки шума между блоками не давала щелчков
+            block = rate * NOISE_BLOCK_SECONDS
+            overlap = int(rate * NOISE_BLOCK_OVERLAP_SECONDS)
+            fade_in = np.linspace(0, 1, overlap, dtype=np.float32)
+            bounds = list(range(0, len(data), block)) + [len(data)]
+            if len(bounds) > 2 and bounds[-1] - bounds[-2] < rate:
+                del bounds[-2]
+
+            raw_tail = None
+            for start, end in zip(bounds, bounds[1:]):
+                if raw_tail is None:
+                    reduced = nr.reduce_noise(y=data[start:end], sr=rate, n_jobs=-1)
+                    head = 0
+                else:
+                    reduced = nr.reduce_noise(
+                        y=np.concatenate([raw_tail, data[start:end]]), sr=rate, n_jobs=-1
+                    )
+                    head = len(raw_tail)
+                    data[start - head:start] = (
+                        data[start - head:start] * (1 - fade_in[:head]) + reduced[:head] * fade_in[:head]
+                    )
+                raw_tail = data[max(start, end - overlap):end].copy()
+                data[start:end] = reduced[head:]
+            return data
         except Exception as e:
             logger.error(f"Audio cleaning failed: {e}")
             raise
 
 class MeetingProcessor:
     def __init__(self):
-        self.whisper = whisper.load_model(WHISPER_MODEL)
+        model = WhisperModel(
+            WHISPER_MODEL,
+            device=WHISPER_DEVICE,
+            compute_type=WHISPER_COMPUTE_TYPE,
+            flash_attention=WHISPER_FLASH_ATTENTION
+        )
+        self.whisper = BatchedInferencePipeline(model=model)
+        # Модель одна на процесс и не реентерабельна
+        self.whisper_lock = threading.Lock()
+        self.warm_up()
+        self.tokenizer = tiktoken.get_encoding(TOKENIZER_ENCODING)
+        # Постоянный пул HTTP/2-соединений: без повторных TLS-рукопожатий на каждый запрос.
+        # Лимиты и таймауты SDK по умолчанию, кроме увеличенного keepalive_expiry
+        self.openai = openai.AsyncOpenAI(
+            api_key=openai.api_key,
+            http_client=openai.DefaultAsyncHttpxClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100, keepalive_expiry=300)
+            )
+        )
+
+    def warm_up(self):
+        # Прогон секунды тишины без VAD при старте, чтобы первый
+        # настоящий запрос не платил за инициализацию CUDA-ядер
+        segments, _ = self.whisper.transcribe(
+            np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32),
+            batch_size=1,
+            vad_filter=False
+        )
+        list(segments)
         
-    def transcribe(self, audio_path: str) -> str:
+    def transcribe(self, audio: np.ndarray) -> str:
         try:
-            result = self.whisper.transcribe(audio_path)
-            return result["text"]
+            with self.whisper_lock:
+                segments, _ = self.whisper.transcribe(
+                    audio,
+                    language=WHISPER_LANGUAGE,
+                    batch_size=WHISPER_BATCH_SIZE,
+                    vad_filter=True
+                )
+                return "".join(segment.text for segment in segments)
         except Exception as e:
             logger.error(f"Transcription failed: {e}")
             raise
 
-    @staticmethod
-    def analyze_text(text: str) -> str:
+    def transcribe_batch(self, audios: list[np.ndarray]) -> list[str]:
+        if len(audios) == 1:
+            return [self.transcribe(audios[0])]
+
+        try:
+            with self.whisper_lock:
+                # Пайплайн берёт один язык на вызов, поэтому язык определяется
+                # по речи каждой записи, и в общий батч попадают записи одного языка
+                groups = {}
+                for index, audio in enumerate(audios):
+                    clips = merge_segments(
+                        get_speech_timestamps(audio, WHISPER_VAD_OPTIONS), WHISPER_VAD_OPTIONS
+                    )
+                    if not clips:
+                        continue
+                    language = WHISPER_LANGUAGE or self.detect_language(audio, clips)
+                    groups.setdefault(language, []).append((index, clips))
+
+                texts = [""] * len(audios)
+                for language, recordings in groups.items():
+                    group_texts = self.transcribe_group(
+                        [audios[index] for index, _ in recordings],
+                        [clips for _, clips in recordings],
+                        language
+                    )
+                    for (index, _), text in zip(recordings, group_texts):
+                        texts[index] = text
+                return texts
+        except Exception as e:
+            logger.error(f"Batch transcription failed: {e}")
+            raise
+
+    def detect_language(self, audio: np.ndarray, clips: list[dict]) -> str:
+        speech = np.concatenate([audio[clip["start"]:clip["end"]] for clip in clips])
+        language, _, _ = self.whisper.model.detect_language(audio=speech)
+        return language
+
+    def transcribe_group(self, audios: list[np.ndarray], clips: list[list[dict]], language: str) -> list[str]:
+        # Записи склеиваются в один массив, а речевые фрагменты каждой
+        # передаются через clip_timestamps (в отсчётах, как ждёт faster-whisper 1.1.1):
+        # фрагменты разных файлов декодируются одним батчем, но не смешиваются
+        offsets, joined_clips = [], []
+        position = 0
+        for audio, audio_clips in zip(audios, clips):
+            offsets.append(position / WHISPER_SAMPLE_RATE)
+            joined_clips.extend(
+                {"start": position + clip["start"], "end": position + clip["end"]}
+                for clip in audio_clips
+            )
+            position += len(audio)
+
+        texts = [""] * len(audios)
+        segments, _ = self.whisper.transcribe(
+            np.concatenate(audios),
+            language=language,
+            batch_size=WHISPER_BATCH_SIZE,
+            clip_timestamps=joined_clips
+        )
+        for segment in segments:
+            # Середина сегмента лежит внутри своего фрагмента, в отличие от
+            # округлённого начала, которое может оказаться у границы соседней записи
+            middle = (segment.start + segment.end) / 2
+            texts[bisect_right(offsets, middle) - 1] += segment.text
+        return texts
+
+    def split_transcript(self, text: str) -> list[str]:
+        tokens = self.tokenizer.encode(text)
+        if len(tokens) <= CHUNK_TOKENS:
+            return [text]
+
+        # Границы окон переводим из токенов в символы и сдвигаем к ближайшему
+        # пробелу: иначе кириллица, разорванная посреди токена, даёт U+FFFD.
+        # В текстах без пробелов (zh, ja, th) остаёмся на границе символа из offsets
+        _, offsets = self.tokenizer.decode_with_offsets(tokens)
+
+        def snap(index: int) -> int:
+            if index >= len(offsets):
+                return len(text)
+            position = offsets[index]
+            limit = min(position + CHUNK_SNAP_CHARS, len(text))
+            for candidate in range(position, limit):
+                if text[candidate].isspace():
+                    return candidate
+            return position
+
+        step = CHUNK_TOKENS - CHUNK_OVERLAP
+        chunks = (
+            text[snap(start) if start else 0:snap(start + CHUNK_TOKENS)].strip()
+            for start in range(0, len(tokens) - CHUNK_OVERLAP, step)
+        )
+        return [chunk for chunk in chunks if chunk]
+
+    async def analyze_chunk(self, text: str) -> str:
         try:
-            response = openai.chat.completions.create(
+            response = await self.openai.chat.completions.create(
                 model=GPT_MODEL,
                 messages=[{
                     "role": "system",
-                    "content": """Проанализируй текст совещания. Выдели:
+                    "content": """Проанализируй фрагмент текста совещания. Выдели:
 1. Участники (имя/роль)
 2. Основные вопросы
 3. Принятые решения
@@ -97,17 +374,27 @@ class MeetingProcessor:
             )
             return response.choices[0].message.content
         except Exception as e:
-            logger.error(f"Text analysis failed: {e}")
+            logger.error(f"Chunk analysis failed: {e}")
             raise
 
-    @staticmethod
-    def generate_protocol(analysis: str) -> str:
+    async def analyze_text(self, text: str, merge: bool = False) -> str:
+        # Анализ и протокол за один запрос к модели; при merge=True на вход
+        # приходят анализы перекрывающихся фрагментов, которые надо свести
+        if merge:
+            task = """Ниже анализы последовательных фрагментов одного совещания. Фрагменты
+перекрываются, поэтому одни и те же участники, вопросы и решения могут
+повторяться: объедини их без дублей."""
+        else:
+            task = """Проанализируй текст совещания: участников (имя/роль), основные вопросы,
+принятые решения, ответственных и сроки."""
         try:
-            response = openai.chat.completions.create(
+            response = await self.openai.chat.completions.create(
                 model=GPT_MODEL,
                 messages=[{
                     "role": "system",
-                    "content": """Создай официальный протокол совещания по шаблону:
+                    "content": task + """
+Верни JSON с единственным ключом "protocol". Его значение — одна строка
+(не объект и не список) с официальным протоколом совещания по шаблону:
 Участники: [список]
 Повестка: [список вопросов]
 Решения:
@@ -115,41 +402,135 @@ class MeetingProcessor:
 ..."""
                 }, {
                     "role": "user",
-                    "content": analysis
+                    "content": text
                 }],
-                temperature=0.5,
+                response_format={"type": "json_object"},
+                temperature=0.2,
                 max_tokens=2000
             )
-            return response.choices[0].message.content
+            result = json.loads(response.choices[0].message.content)
+            protocol = result.get("protocol") if isinstance(result, dict) else None
+            if not isinstance(protocol, str) or not protocol.strip():
+                raise ValueError(f"Unexpected protocol in model response: {protocol!r}")
+            return protocol
         except Exception as e:
-            logger.error(f"Protocol generation failed: {e}")
+            logger.error(f"Text analysis failed: {e}")
             raise
 
+    async def generate_protocol(self, transcript: str) -> str:
+        # Кэш по расшифровке: для одного аудио она детерминирована, в отличие от анализа
+        key = xxhash.xxh3_128_hexdigest(transcript.encode())
+        cache_key = f"protocol:{key}"
+        protocol = read_cache(cache_key)
+        if protocol is not None:
+            return protocol
+
+        # Фрагменты анализируются параллельно, затем итог сводится одним запросом
+        chunks = self.split_transcript(transcript)
+        if len(chunks) > 1:
+            partial = await asyncio.gather(
+                *(self.analyze_chunk(chunk) for chunk in chunks)
+            )
+            protocol = await self.analyze_text("\n\n".join(partial), merge=True)
+        else:
+            protocol = await self.analyze_text(transcript)
+        write_cache(cache_key, protocol)
+        return protocol
+
+# Собирает записи, пришедшие почти одновременно, в один батч Whisper
+class TranscriptionBatcher:
+    def __init__(self, processor: MeetingProcessor):
+        self.processor = processor
+        self.queue = asyncio.Queue()
+        # Whisper в одном потоке: GPU одна
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    async def transcribe(self, audio: np.ndarray) -> str:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((audio, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            deadline = loop.time() + BATCH_WINDOW
+            while len(items) < BATCH_MAX_FILES:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            audios = [audio for audio, _ in items]
+            try:
+                texts = await loop.run_in_executor(
+                    self.executor, self.processor.transcribe_batch, audios
+                )
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), text in zip(items, texts):
+                if not future.done():
+                    future.set_result(text)
+
+async def get_transcript(batcher: TranscriptionBatcher, source: str | BytesIO, clean: bool) -> str:
+    # Одинаковое аудио не расшифровывается повторно
+    loop = asyncio.get_running_loop()
+    key = await loop.run_in_executor(None, AudioProcessor.hash_audio, source)
+    cache_key = f"transcript:{key}"
+    transcript = read_cache(cache_key)
+    if transcript:
+        return transcript
+
+    data, rate = await loop.run_in_executor(None, AudioProcessor.load_audio, source)
+    if clean:
+        # В потоке, а не в процессе: FFT numpy/scipy отпускает GIL, а массив
+        # обрабатывается на месте без копирования туда и обратно
+        data = await loop.run_in_executor(None, AudioProcessor.clean_audio, data, rate)
+    transcript = await batcher.transcribe(data)
+    # Пустую расшифровку не кэшируем и не отправляем в GPT
+    if not transcript.strip():
+        raise NoSpeechError("No speech detected")
+    write_cache(cache_key, transcript)
+    return transcript
+
 async def handle_audio(update: Update, context):
     try:
         user = update.message.from_user
         logger.info(f"Processing audio from {user.username}")
 
+        # file_unique_id одинаков для одного и того же файла, поэтому
+        # повторно присланное аудио отдаём из кэша без обработки
+        unique_id = update.message.audio.file_unique_id
+        cache_key = f"audio:{unique_id}"
+        protocol = read_cache(cache_key)
+        if protocol is not None:
+            await update.message.reply_text(f"✅ Протокол готов:\n\n{protocol}")
+            return
+
         # Скачивание файла
         audio_file = await update.message.audio.get_file()
-        file_hash = hashlib.md5(audio_file.file_id.encode()).hexdigest()
-        input_path = os.path.join(AUDIO_CACHE, f"{file_hash}.wav")
-        await audio_file.download_to_drive(input_path)
+        # Бот получает файлы не больше 20 МБ, поэтому качаем сразу в память
+        buffer = BytesIO()
+        await audio_file.download_to_memory(out=buffer)
+        buffer.seek(0)
 
         # Обработка
-        cleaned_path = AudioProcessor.clean_audio(input_path)
-        processor = MeetingProcessor()
-        transcript = processor.transcribe(cleaned_path)
-        analysis = processor.analyze_text(transcript)
-        protocol = processor.generate_protocol(analysis)
+        processor = context.bot_data["processor"]
+        transcript = await get_transcript(context.bot_data["batcher"], buffer, clean=True)
+        protocol = await processor.generate_protocol(transcript)
+        write_cache(cache_key, protocol)
 
         # Отправка результата
         await update.message.reply_text(f"✅ Протокол готов:\n\n{protocol}")
-        
-        # Очистка кэша
-        os.remove(input_path)
-        os.remove(cleaned_path)
 
+    except NoSpeechError:
+        await update.message.reply_text("🔇 В записи не найдено речи")
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         await update.message.reply_text("❌ Ошибка обработки файла")
@@ -162,20 +543,22 @@ async def handle_youtube(update: Update, context):
             return
 
         # Скачивание аудио
-        audio_path = AudioProcessor.download_youtube_audio(url)
+        loop = asyncio.get_running_loop()
+        audio_path = await loop.run_in_executor(None, AudioProcessor.download_youtube_audio, url)
         
         # Обработка
-        processor = MeetingProcessor()
-        transcript = processor.transcribe(audio_path)
-        analysis = processor.analyze_text(transcript)
-        protocol = processor.generate_protocol(analysis)
+        processor = context.bot_data["processor"]
+        try:
+            transcript = await get_transcript(context.bot_data["batcher"], audio_path, clean=False)
+        finally:
+            os.remove(audio_path)
+        protocol = await processor.generate_protocol(transcript)
 
         # Отправка результата
         await update.message.reply_text(f"🎥 Протокол из YouTube-видео:\n\n{protocol}")
-        
-        # Очистка
-        os.remove(audio_path)
 
+    except NoSpeechError:
+        await update.message.reply_text("🔇 В видео не найдено речи")
     except Exception as e:
         logger.error(f"YouTube error: {str(e)}")
         await update.message.reply_text("❌ Ошибка обработки YouTube видео")
@@ -189,8 +572,36 @@ async def start(update: Update, context):
         "Я сгенерирую структурированный протокол!"
     )
 
+async def post_init(application: Application):
+    batcher = TranscriptionBatcher(application.bot_data["processor"])
+    application.bot_data["batcher"] = batcher
+    # post_init выполняется до Application.start(), и задачи application.create_task
+    # в этот момент PTB не отслеживает: цикл батчера запускаем и останавливаем сами
+    application.bot_data["batcher_task"] = asyncio.create_task(batcher.run())
+
+async def post_stop(application: Application):
+    task = application.bot_data["batcher_task"]
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+async def post_shutdown(application: Application):
+    application.bot_data["batcher"].executor.shutdown()
+    CACHE.close()
+
 def main():
-    application = Application.builder().token(TELEGRAM_TOKEN).build()
+    open_cache()
+    application = (
+        Application.builder()
+        .token(TELEGRAM_TOKEN)
+        .concurrent_updates(CONCURRENT_UPDATES)
+        .post_init(post_init)
+        .post_stop(post_stop)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
+    # Модель Whisper загружается один раз при старте, а не на каждый запрос
+    application.bot_data["processor"] = MeetingProcessor()
 
     # Обработчики команд
     application.add_handler(CommandHandler("start", start))
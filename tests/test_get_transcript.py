@@ -0,0 +1,42 @@
+import asyncio
+from io import BytesIO
+
+import numpy as np
+import pytest
+
+import neuro_secretary2
+from neuro_secretary2 import AudioProcessor, NoSpeechError, get_transcript
+
+
+class FakeBatcher:
+    def __init__(self, text):
+        self.text = text
+
+    async def transcribe(self, audio):
+        return self.text
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    store = {}
+    monkeypatch.setattr(neuro_secretary2, "read_cache", store.get)
+    monkeypatch.setattr(neuro_secretary2, "write_cache", store.__setitem__)
+    monkeypatch.setattr(AudioProcessor, "hash_audio", staticmethod(lambda source: "key"))
+    monkeypatch.setattr(
+        AudioProcessor, "load_audio", staticmethod(lambda source: (np.zeros(16000, np.float32), 16000))
+    )
+    return store
+
+
+def test_get_transcript_caches_text(cache):
+    transcript = asyncio.run(get_transcript(FakeBatcher(" Привет"), BytesIO(b""), clean=False))
+
+    assert transcript == " Привет"
+    assert cache == {"transcript:key": " Привет"}
+
+
+def test_get_transcript_rejects_silence_without_caching(cache):
+    with pytest.raises(NoSpeechError):
+        asyncio.run(get_transcript(FakeBatcher(" "), BytesIO(b""), clean=False))
+
+    assert cache == {}
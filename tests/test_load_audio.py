@@ -0,0 +1,38 @@
+import shutil
+import subprocess
+from io import BytesIO
+
+import pytest
+
+from neuro_secretary2 import AudioProcessor, WHISPER_SAMPLE_RATE
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+
+def encode_sine(path, seconds, codec):
+    subprocess.run(
+        [
+            "ffmpeg", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+            "-ac", "2", "-ar", "48000", "-c:a", codec, str(path)
+        ],
+        check=True
+    )
+
+
+# 60-секундный m4a держит moov в конце файла и не читается из pipe
+@pytest.mark.parametrize("name, codec", [("meeting.mp3", "libmp3lame"), ("meeting.m4a", "aac")])
+def test_load_audio_from_memory_and_path(tmp_path, name, codec):
+    path = tmp_path / name
+    encode_sine(path, 60, codec)
+
+    for source in (str(path), BytesIO(path.read_bytes())):
+        data, rate = AudioProcessor.load_audio(source)
+        assert rate == WHISPER_SAMPLE_RATE
+        assert data.ndim == 1
+        assert abs(len(data) / rate - 60) < 0.1
+
+
+def test_load_audio_reports_ffmpeg_error():
+    with pytest.raises(RuntimeError, match="Invalid data"):
+        AudioProcessor.load_audio(BytesIO(b"not audio at all"))
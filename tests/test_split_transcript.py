@@ -0,0 +1,44 @@
+import tiktoken
+
+import neuro_secretary2
+from neuro_secretary2 import MeetingProcessor
+
+# Побайтовый токенизатор: многобайтовые символы всегда режутся посреди токена
+BYTE_TOKENIZER = tiktoken.Encoding(
+    name="bytes",
+    pat_str=r"\S+|\s+",
+    mergeable_ranks={bytes([i]): i for i in range(256)},
+    special_tokens={}
+)
+
+
+def make_processor(monkeypatch):
+    monkeypatch.setattr(neuro_secretary2, "CHUNK_TOKENS", 800)
+    monkeypatch.setattr(neuro_secretary2, "CHUNK_OVERLAP", 50)
+    processor = MeetingProcessor.__new__(MeetingProcessor)
+    processor.tokenizer = BYTE_TOKENIZER
+    return processor
+
+
+def test_split_transcript_snaps_to_whitespace(monkeypatch):
+    processor = make_processor(monkeypatch)
+    text = " ".join(["Иванов предложил увеличить бюджет."] * 100)
+
+    chunks = processor.split_transcript(text)
+
+    assert len(chunks) > 1
+    assert all("�" not in chunk for chunk in chunks)
+    assert all(chunk.split()[0] in text.split() for chunk in chunks)
+    assert chunks[-1].endswith("бюджет.")
+
+
+def test_split_transcript_without_spaces(monkeypatch):
+    processor = make_processor(monkeypatch)
+    text = "会议讨论了预算问题并做出了决定。" * 100
+
+    chunks = processor.split_transcript(text)
+
+    assert len(chunks) > 1
+    assert all(chunks)
+    assert all("�" not in chunk for chunk in chunks)
+    assert max(len(chunk) for chunk in chunks) < len(text) / 2
@@ -0,0 +1,77 @@
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+from faster_whisper.vad import collect_chunks
+
+import neuro_secretary2
+from neuro_secretary2 import MeetingProcessor, WHISPER_SAMPLE_RATE
+
+
+class FakeModel:
+    # Язык «определяется» по знаку сигнала: положительный — ru, отрицательный — en
+    def detect_language(self, audio):
+        return ("ru" if audio.mean() > 0 else "en"), 1.0, []
+
+
+class FakePipeline:
+    def __init__(self):
+        self.model = FakeModel()
+        self.calls = []
+
+    def transcribe(self, audio, language=None, batch_size=16, clip_timestamps=None, **kwargs):
+        assert language is not None
+        self.calls.append(language)
+        # Нарезка та же, что в BatchedInferencePipeline 1.1.1
+        chunks, metadata = collect_chunks(audio, clip_timestamps)
+        segments = [
+            SimpleNamespace(
+                start=round(meta["start_time"], 3),
+                end=round(meta["end_time"], 3),
+                text=f"{language}:{abs(chunk.mean()):.1f} "
+            )
+            for chunk, meta in zip(chunks, metadata)
+        ]
+        return iter(segments), None
+
+
+def fake_speech_timestamps(audio, vad_options=None):
+    # Речь — вся запись без первой и последней десятой секунды,
+    # нарезанная кусками по 20 секунд, как при max_speech_duration_s
+    margin = WHISPER_SAMPLE_RATE // 10
+    piece = WHISPER_SAMPLE_RATE * 20
+    bounds = list(range(margin, len(audio) - margin, piece)) + [len(audio) - margin]
+    return [{"start": start, "end": end} for start, end in zip(bounds, bounds[1:])]
+
+
+def make_processor():
+    processor = MeetingProcessor.__new__(MeetingProcessor)
+    processor.whisper = FakePipeline()
+    processor.whisper_lock = threading.Lock()
+    return processor
+
+
+def recording(value, seconds):
+    return np.full(int(WHISPER_SAMPLE_RATE * seconds) + 7, value, dtype=np.float32)
+
+
+def test_transcribe_batch_keeps_recordings_and_languages_apart(monkeypatch):
+    monkeypatch.setattr(neuro_secretary2, "get_speech_timestamps", fake_speech_timestamps)
+    monkeypatch.setattr(neuro_secretary2, "WHISPER_LANGUAGE", None)
+    processor = make_processor()
+
+    texts = processor.transcribe_batch([recording(0.1, 3), recording(-0.2, 2), recording(0.3, 45)])
+
+    assert texts == ["ru:0.1 ", "en:0.2 ", "ru:0.3 ru:0.3 "]
+    assert sorted(processor.whisper.calls) == ["en", "ru"]
+
+
+def test_transcribe_batch_uses_configured_language(monkeypatch):
+    monkeypatch.setattr(neuro_secretary2, "get_speech_timestamps", fake_speech_timestamps)
+    monkeypatch.setattr(neuro_secretary2, "WHISPER_LANGUAGE", "ru")
+    processor = make_processor()
+
+    texts = processor.transcribe_batch([recording(0.1, 3), recording(-0.2, 2)])
+
+    assert texts == ["ru:0.1 ", "ru:0.2 "]
+    assert processor.whisper.calls == ["ru"]
@@ -0,0 +1,38 @@
+import asyncio
+import contextlib
+
+import numpy as np
+
+from neuro_secretary2 import TranscriptionBatcher
+
+
+class FakeProcessor:
+    def __init__(self):
+        self.batches = []
+
+    def transcribe_batch(self, audios):
+        self.batches.append(len(audios))
+        return [f"text {audio[0]:.0f}" for audio in audios]
+
+
+async def transcribe_concurrently(processor, count):
+    batcher = TranscriptionBatcher(processor)
+    task = asyncio.create_task(batcher.run())
+    try:
+        return await asyncio.gather(
+            *(batcher.transcribe(np.full(16, index, dtype=np.float32)) for index in range(count))
+        )
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        batcher.executor.shutdown()
+
+
+def test_overlapping_recordings_share_one_batch():
+    processor = FakeProcessor()
+
+    texts = asyncio.run(transcribe_concurrently(processor, 2))
+
+    assert texts == ["text 0", "text 1"]
+    assert processor.batches == [2]